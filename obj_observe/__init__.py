@@ -1,3 +1,3 @@
-from .core import observe, remove_observers, remove_observer, ObservableDict
+from .core import observe, remove_observers, remove_observer, batched_notifications, ObservableDict
 
-__all__ = ["observe", "remove_observers", "remove_observer", "ObservableDict"]
+__all__ = ["observe", "remove_observers", "remove_observer", "batched_notifications", "ObservableDict"]
@@ -4,77 +4,497 @@ Public API:
     - ObservableDict: dict subclass that notifies observers on key changes.
     - observe(obj, attr, callback=None): register an observer on attr/key.
     - remove_observers(obj, attr=None): detach observers.
+    - batched_notifications(obj): defer and coalesce notifications in a with block.
 
 Implementation notes:
     * Attribute observation works by monkey-patching the owning class's __setattr__
       exactly once and keeping a per-class reference count so removing observers
       from one instance does not break remaining observers on other instances.
-    * ObservableDict handles its own recursion guard per key.
+    * All class-level bookkeeping lives in a single _ClassState stored in the
+      class's own __dict__ as __observe_state__, so subclasses are patched
+      separately. A bucket is the instance's {attr: observers} dict: instances
+      with a __dict__ keep it in __observers__, slotted instances in the state's
+      map keyed by id(obj), with a weakref callback cleaning up when the
+      instance allows it.
+    * Recursion is guarded per thread by (id(obj), attr or key) tokens, shared by
+      ObservableDict and patched classes.
 """
 from __future__ import annotations
-from typing import Any, Callable, Dict, Iterable, Optional, Union, overload, TypedDict, cast
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar, overload
+import sys
 import threading
+import types
 import weakref
 
+_T = TypeVar('_T')
 Observer = Callable[[Any, Any], None]
-ObserverRef = Union[Observer, weakref.WeakMethod]
+# (is_weak, ref): resolved at registration so notify loops branch on a plain bool.
+# ref is the observer itself, or a WeakMethod called with no arguments to get it back;
+# a bool cannot narrow a Union, so both are typed as the callable they are.
+ObserverRef = Tuple[bool, Callable[..., Any]]
 
+class _OwnedLock:
+    """Non-reentrant lock that remembers which thread holds it."""
 
-class _StorageBucket(TypedDict, total=False):
-    __observers__: Dict[str, list[ObserverRef]]
-    __is_observing__: Dict[str, bool]
-    finalizer: weakref.finalize
+    __slots__ = ('_lock', 'owner')
 
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.owner: Optional[int] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self._lock.acquire(blocking):
+            return False
+        self.owner = threading.get_ident()
+        return True
+
+    def release(self) -> None:
+        self.owner = None
+        self._lock.release()
+
+    def held_here(self) -> bool:
+        """Whether the calling thread holds the lock."""
+        return self.owner == threading.get_ident()
+
+
+# Guards observer registration, class patching and bucket lifetime; notify paths
+# never take it. Locked sections allocate, so GC may run weakref callbacks and
+# user finalizers on a thread already holding it. Those must not block on it:
+# library callbacks hand their work to _schedule, and public calls made from a
+# finalizer are queued by _guarded.
+_observers_lock = _OwnedLock()
+
+# Work that must run under _observers_lock, queued while another section held it
+_deferred: list[Callable[[], Any]] = []
+
+class _Reentry(threading.local):
+    """Per-thread recursion guard: (id(obj), attr or key) pairs currently notifying."""
+
+    def __init__(self) -> None:
+        self.active: set[tuple[int, Any]] = set()
+
+
+_reentry = _Reentry()
+
+
+class _Batches(threading.local):
+    """Per-thread pending notifications: id(obj) -> {attr or key: [old, new]}."""
+
+    def __init__(self) -> None:
+        self.pending: Dict[int, Dict[Any, list[Any]]] = {}
+
+
+_batches = _Batches()
+
+# Storage mode per class, probed from the first observed instance. The answer is
+# class-invariant, so re-patching a class after all observers left skips the probe.
+_class_modes: weakref.WeakKeyDictionary[type, str] = weakref.WeakKeyDictionary()
+
+# Bound once so ObservableDict.__setitem__ skips the super() proxy on every write
+_dict_setitem = dict.__setitem__
+_dict_get = dict.get
+
+
+# Per-instance bucket: attribute name -> observers. The single container an observed
+# instance needs; slotted instances' weakrefs live in a separate class-level map.
+_Bucket = Dict[str, Tuple[ObserverRef, ...]]
 
-def _weak_or_id_key(obj: Any) -> tuple[Dict[Any, _StorageBucket], Any, bool]:
-    """Return (map, key, is_weak) for slotted instances without __dict__.
 
-    Uses WeakKeyDictionary when the instance supports weakrefs; otherwise a
-    normal dict keyed by id(obj) with no GC-based auto-clean.
+def _run_deferred() -> None:
+    """Run queued cleanup in order. Caller holds _observers_lock."""
+    while _deferred:
+        _deferred.pop(0)()
+
+
+def _schedule(work: Callable[[], None]) -> None:
+    """Queue work that needs _observers_lock, running it now if the lock is free.
+
+    Otherwise the lock holder runs it before releasing; if that already happened,
+    the next registration or removal runs it on entry.
     """
-    # Ensure class containers exist
-    storage_map: Optional[Dict[Any, _StorageBucket]] = getattr(
-        obj.__class__, '__allow_observe_storage__', None
-    )
-    storage_map_id: Optional[Dict[Any, _StorageBucket]] = getattr(
-        obj.__class__, '__allow_observe_storage_by_id__', None
-    )
-
-    # Try weakref first
-    supports_weak = True
+    _deferred.append(work)
+    if _observers_lock.acquire(blocking=False):
+        try:
+            _run_deferred()
+        finally:
+            _observers_lock.release()
+
+
+@contextmanager
+def _locked() -> Iterator[None]:
+    """Hold _observers_lock, running deferred work on entry and before release."""
+    _observers_lock.acquire()
     try:
-        weakref.ref(obj)
-    except TypeError:
-        supports_weak = False
-
-    if supports_weak:
-        if storage_map is None:
-            storage_map = weakref.WeakKeyDictionary()  # type: ignore[assignment]
-            setattr(obj.__class__, '__allow_observe_storage__', storage_map)
-        storage_map_typed: Dict[Any, _StorageBucket] = cast(Dict[Any, _StorageBucket], storage_map)
-        return storage_map_typed, obj, True
-
-    # Fallback to id(obj) keyed storage
-    if storage_map_id is None:
-        storage_map_id = {}
-        setattr(obj.__class__, '__allow_observe_storage_by_id__', storage_map_id)
-    storage_map_id_typed: Dict[Any, _StorageBucket] = cast(Dict[Any, _StorageBucket], storage_map_id)
-    return storage_map_id_typed, id(obj), False
-
-
-def _normalize_callback(callback: Observer) -> ObserverRef:
+        _run_deferred()
+        try:
+            yield
+        finally:
+            _run_deferred()
+    finally:
+        _observers_lock.release()
+
+
+def _guarded(work: Callable[[], _T], deferred_result: _T) -> _T:
+    """Run work under _observers_lock and return its result.
+
+    If this thread already holds the lock (a finalizer run by GC inside a locked
+    section called back into the API), work is queued for that section to run
+    before it releases the lock, and deferred_result is returned instead.
+    """
+    if _observers_lock.held_here():
+        _deferred.append(work)
+        return deferred_result
+    with _locked():
+        return work()
+
+
+def _normalize_callback(callback: Observer,
+                        on_dead: Optional[Callable[[weakref.WeakMethod], None]] = None) -> ObserverRef:
     """Store bound methods as WeakMethod to avoid keeping instances alive."""
-    self_obj = getattr(callback, '__self__', None)
-    func = getattr(callback, '__func__', None)
-    if self_obj is not None and func is not None:
+    if isinstance(callback, types.MethodType):
         try:
-            return weakref.WeakMethod(callback)  # type: ignore[arg-type]
+            return (True, weakref.WeakMethod(callback, on_dead))  # type: ignore[arg-type]
         except TypeError:
             # Fallback if object cannot be weak-referenced
-            return callback
+            return (False, callback)
+    return (False, callback)
+
+
+def _without(observers: tuple[ObserverRef, ...], callback: Observer) -> Optional[tuple[ObserverRef, ...]]:
+    """Return observers minus the first entry matching callback, or None if absent."""
+    for candidate in ((False, callback), _normalize_callback(callback)):
+        try:
+            index = observers.index(candidate)
+        except ValueError:
+            continue
+        return observers[:index] + observers[index + 1:]
+    return None
+
+
+def _prune_dead_observers(state: Optional[_ClassState], owner: int,
+                          observers_map: Dict[Any, Tuple[ObserverRef, ...]], key: Any) -> None:
+    """Drop dead WeakMethod entries from observers_map[key]. Caller holds the lock.
+
+    state is None for ObservableDict. For a patched class, owner is id() of the
+    instance whose bucket observers_map is, released once pruning empties it.
+    """
+    observers = observers_map.get(key)
+    if not observers:
+        return
+    alive = tuple(entry for entry in observers if not entry[0] or entry[1]() is not None)
+    if len(alive) == len(observers):
+        return
+    if alive:
+        observers_map[key] = alive
+    else:
+        del observers_map[key]
+        if state is not None:
+            _forget_names(state.names, (key,))
+            if not observers_map:
+                _release_pruned_bucket(state, owner, observers_map)
+
+
+def _observer_died(state: Optional[_ClassState], owner: int, observers_map: Dict[Any, Tuple[ObserverRef, ...]],
+                   key: Any) -> Callable[[weakref.WeakMethod], None]:
+    """Build the WeakMethod callback that prunes the entry once its owner is gone."""
+    def callback(_ref: weakref.WeakMethod) -> None:
+        _schedule(lambda: _prune_dead_observers(state, owner, observers_map, key))
     return callback
 
 
+def _observe_mode(cls: type, obj: Any) -> str:
+    """Pick the class-wide storage strategy: 'dict', 'slots_weak' or 'slots_id'."""
+    mode = _class_modes.get(cls)
+    if mode is None:
+        if hasattr(obj, '__dict__'):
+            mode = 'dict'
+        else:
+            try:
+                weakref.ref(obj)
+                mode = 'slots_weak'
+            except TypeError:
+                mode = 'slots_id'
+        _class_modes[cls] = mode
+    return mode
+
+
+class _ClassState:
+    """Bookkeeping for one patched class, kept in cls.__dict__['__observe_state__'].
+
+    Looked up in the class's own __dict__, never inherited: a subclass whose
+    instances get observed is patched with its own state. A fresh state is built
+    each time a class is patched, so callbacks left over from an earlier patch
+    only ever touch the state they were created for.
+    """
+
+    __slots__ = ('cls', 'original_setattr', 'own_setattr', 'refcount', 'names', 'storage', 'refs')
+
+    def __init__(self, cls: type, mode: str, original_setattr: Callable[..., None],
+                 own_setattr: bool) -> None:
+        self.cls = cls
+        # Unbound (self, name, value); typed loosely because mypy sees cls.__setattr__
+        # as bound to the class object
+        self.original_setattr = original_setattr
+        # Whether __setattr__ was defined on cls itself (restored) or inherited (deleted)
+        self.own_setattr = own_setattr
+        self.refcount = 0
+        # Observed name -> number of instances observing it. Decremented on removal and
+        # when a slotted instance dies, so it may over-count dead dict-backed instances
+        # but never under-counts live ones.
+        self.names: Dict[str, int] = {}
+        # mode (memoized in _class_modes) only decides which containers exist.
+        # Slotted instances cannot hold their own bucket; keep it here. Keys are
+        # id(obj) so lookups never dispatch to a user-defined __hash__/__eq__.
+        self.storage: Optional[Dict[int, _Bucket]] = None if mode == 'dict' else {}
+        # Weakrefs whose callbacks release dead instances, keyed like storage
+        self.refs: Optional[Dict[int, weakref.ref]] = None if mode == 'slots_id' else {}
+
+    def bucket(self, obj: Any) -> Optional[_Bucket]:
+        """Return obj's bucket, or None if obj has no observers."""
+        if self.storage is None:
+            return obj.__dict__.get('__observers__')
+        return self.storage.get(id(obj))
+
+
+def _class_state(cls: type) -> Optional[_ClassState]:
+    """Return cls's own patch state, ignoring any inherited from a patched base."""
+    return cls.__dict__.get('__observe_state__')
+
+
+def _unpatch_class(state: _ClassState) -> None:
+    """Restore the original __setattr__ and drop the class-level bookkeeping."""
+    cls = state.cls
+    if state.own_setattr:
+        cls.__setattr__ = state.original_setattr  # type: ignore[method-assign]
+    else:
+        del cls.__setattr__  # inherit again, including a base's later patch
+    del cls.__observe_state__  # type: ignore[attr-defined]
+
+
+def _forget_names(counts: Dict[str, int], names: Iterable[str]) -> None:
+    """Decrement observed-name counts for names an instance stopped observing."""
+    for name in names:
+        left = counts.get(name, 0) - 1
+        if left > 0:
+            counts[name] = left
+        else:
+            counts.pop(name, None)
+
+
+def _release_class(state: _ClassState) -> None:
+    """Drop one observed instance from the class refcount, unpatching at zero."""
+    state.refcount -= 1
+    if state.refcount <= 0 and _class_state(state.cls) is state:
+        _unpatch_class(state)
+
+
+_MISSING = object()
+
+
+def _read_dict_attr(obj: Any, name: str, default: Any = None) -> Any:
+    """getattr() for __dict__-backed instances, served from __dict__ when possible.
+
+    Plain instance attributes cost one dict get; names not in __dict__ (class
+    attributes, properties, first assignments) fall back to getattr().
+    """
+    value = obj.__dict__.get(name, _MISSING)
+    if value is _MISSING:
+        return getattr(obj, name, default)
+    return value
+
+
+def _read_slot(obj: Any, name: str, default: Any = None) -> Any:
+    """getattr() for slotted instances that reads through the type's descriptor directly.
+
+    Skips any __getattribute__/__getattr__ hooks defined on the class.
+    """
+    try:
+        return object.__getattribute__(obj, name)
+    except AttributeError:
+        return default
+
+
+def _defer(pending: Dict[Any, list[Any]], name: Any, old_value: Any, value: Any) -> None:
+    """Record a batched change, keeping the first old value and the latest new one."""
+    entry = pending.get(name)
+    if entry is None:
+        pending[name] = [old_value, value]
+    else:
+        entry[1] = value
+
+
+def _dispatch(observers: tuple[ObserverRef, ...], old_value: Any, value: Any) -> None:
+    """Call each live observer with (old_value, value)."""
+    for is_weak, ref in observers:
+        target = ref() if is_weak else ref
+        if target is not None:
+            target(old_value, value)
+
+
+def _notify(obj: Any, name: Any, value: Any, assign: Callable[[Any, Any, Any], None],
+            read_old: Callable[[Any, Any, Any], Any], observers: tuple[ObserverRef, ...]) -> None:
+    """Observed write for patched classes (attr) and ObservableDict (key).
+
+    This is the only place the old value is read. It runs without any lock:
+    observers is an immutable snapshot, so callbacks may add or remove observers
+    freely. The recursion guard is per thread and keyed by (id(obj), name).
+    """
+    active = _reentry.active
+    token = (id(obj), name)
+    if token in active:  # recursion guard
+        assign(obj, name, value)
+        return
+
+    active.add(token)
+    try:
+        old_value = read_old(obj, name, None)
+        assign(obj, name, value)
+
+        batches = _batches.pending
+        if batches and id(obj) in batches:
+            _defer(batches[id(obj)], name, old_value, value)
+            return
+        _dispatch(observers, old_value, value)
+    finally:
+        active.discard(token)
+
+
+def _make_setattr(state: _ClassState) -> Callable[[Any, str, Any], None]:
+    """Build the patched __setattr__ for state's class.
+
+    The original __setattr__, the class's observed-name counts and the storage for
+    its mode are bound into the closure. A write to a name no instance of cls
+    observes costs one dict lookup before reaching the original __setattr__;
+    otherwise the instance's bucket is checked with a single lookup into known
+    storage.
+    """
+    original_setattr = state.original_setattr
+    observed_names = state.names
+
+    if state.storage is None:
+        def __setattr__(self: Any, name: str, value: Any) -> None:
+            if name in observed_names:
+                bucket = self.__dict__.get('__observers__')
+                observers = bucket.get(name) if bucket is not None else None
+                if observers is not None:
+                    _notify(self, name, value, original_setattr, _read_dict_attr, observers)
+                    return
+            original_setattr(self, name, value)
+    else:
+        storage_map = state.storage
+
+        def __setattr__(self: Any, name: str, value: Any) -> None:
+            if name in observed_names:
+                bucket = storage_map.get(id(self))
+                observers = bucket.get(name) if bucket is not None else None
+                if observers is not None:
+                    _notify(self, name, value, original_setattr, _read_slot, observers)
+                    return
+            original_setattr(self, name, value)
+    return __setattr__
+
+
+def _patch_class(cls: type, mode: str) -> _ClassState:
+    """Install the mode-specific __setattr__ and class-level bookkeeping."""
+    own_setattr = '__setattr__' in cls.__dict__
+    original_setattr: Callable[..., None] = cls.__setattr__
+    if not own_setattr:
+        # Inherited from a patched base: chain to the base's original so the base's
+        # patch does not see this class's instances (dict-backed buckets would fire twice)
+        for klass in cls.__mro__[1:]:
+            if '__setattr__' in klass.__dict__:
+                base_state = _class_state(klass)
+                if base_state is not None:
+                    original_setattr = base_state.original_setattr
+                break
+    state = _ClassState(cls, mode, original_setattr, own_setattr)
+    cls.__observe_state__ = state  # type: ignore[attr-defined]
+    cls.__setattr__ = _make_setattr(state)  # type: ignore[assignment, method-assign]
+    return state
+
+
+def _dead_instance_callback(state: _ClassState, key: int) -> Callable[[weakref.ref], None]:
+    """Build the weakref callback that drops a dead instance's bucket and releases its class.
+
+    A dict-backed instance's bucket dies with its __dict__. The callback must not
+    hold it, or an observer closing over the instance would keep it alive through
+    the class, so only slotted buckets have their names forgotten here. Counts and
+    unpatching go through _schedule, so they only ever change under _observers_lock.
+    """
+    refs: Dict[int, weakref.ref] = state.refs  # type: ignore[assignment]
+
+    def release(ref: weakref.ref, bucket: Optional[_Bucket]) -> None:
+        if refs.get(key) is ref:
+            del refs[key]
+            if bucket:
+                _forget_names(state.names, bucket)
+                bucket.clear()
+            _release_class(state)
+
+    def callback(ref: weakref.ref) -> None:
+        if refs.get(key) is not ref:
+            return
+        # The id can be reused once the instance is gone, so unhook the slotted bucket
+        # from the lock-free write path now; no live instance shares this key
+        bucket = state.storage.pop(key, None) if state.storage is not None else None
+        _schedule(lambda: release(ref, bucket))
+    return callback
+
+
+def _create_bucket(state: _ClassState, obj: Any) -> _Bucket:
+    """Attach an empty bucket to obj in its class's storage and count the instance."""
+    bucket: _Bucket = {}
+    key = id(obj)
+    if state.storage is None:
+        # Write straight into __dict__ so the patched __setattr__ is not involved
+        obj.__dict__['__observers__'] = bucket
+    else:
+        state.storage[key] = bucket
+    if state.refs is not None:
+        try:
+            state.refs[key] = weakref.ref(obj, _dead_instance_callback(state, key))
+        except TypeError:
+            pass  # dict-backed without __weakref__: stays counted until removal
+    state.refcount += 1
+    return bucket
+
+
+def _drop_bucket(state: _ClassState, obj: Any) -> None:
+    """Detach obj's bucket and release its hold on the class patch."""
+    key = id(obj)
+    if state.storage is None:
+        obj.__dict__.pop('__observers__', None)
+    else:
+        state.storage.pop(key, None)
+    if state.refs is not None:
+        # Dropping the weakref means its death callback never fires
+        state.refs.pop(key, None)
+    _release_class(state)
+
+
+def _release_pruned_bucket(state: _ClassState, key: int, bucket: _Bucket) -> None:
+    """Detach a bucket emptied by pruning and release its hold on the class patch.
+
+    Only a bucket still attached to its live instance is released. Dict-backed
+    instances are reached through their weakref, so one without __weakref__ keeps
+    the empty bucket, still counted, until remove_observers() drops it.
+    """
+    if state.storage is not None:
+        if state.storage.get(key) is not bucket:
+            return
+        del state.storage[key]
+    else:
+        ref = state.refs.get(key) if state.refs is not None else None
+        obj = ref() if ref is not None else None
+        if obj is None or obj.__dict__.get('__observers__') is not bucket:
+            return
+        del obj.__dict__['__observers__']
+    if state.refs is not None:
+        state.refs.pop(key, None)
+    _release_class(state)
+
+
 class ObservableDict(dict):
     """Dictionary that notifies registered observers when a key's value changes.
 
@@ -82,48 +502,52 @@ class ObservableDict(dict):
     """
 
     # Type hints for private attributes (pre-declared so linters know they exist)
-    __observers: Dict[Any, list[ObserverRef]]  # key -> list of callbacks (may be WeakMethod)
-    __is_observing: Dict[Any, bool]         # recursion guard per key currently being set
+    __observers: Dict[Any, tuple[ObserverRef, ...]]  # key -> (is_weak, callback or WeakMethod) entries
 
     def __init__(self, *args: Iterable[Any], **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         # Normal attribute assignment is fine (no custom __setattr__).
         self.__observers = {}
-        self.__is_observing = {}
 
     def __setitem__(self, key: Any, value: Any) -> None:  # type: ignore[override]
-        if key not in self.__is_observing:
-            self.__is_observing[key] = False
-
-        if self.__is_observing.get(key):
-            super().__setitem__(key, value)
+        # Tuples are replaced, never mutated, so no defensive copy is needed
+        observers = self.__observers.get(key)
+        if observers is None:  # unobserved key: no old value, guard or batch to consider
+            _dict_setitem(self, key, value)
             return
-
-        self.__is_observing[key] = True
-        old_value = self.get(key)
-        super().__setitem__(key, value)
-
-        if key in self.__observers:
-            for observer in list(self.__observers[key]):  # copy to allow mutation during iteration
-                # Resolve WeakMethod if present
-                if isinstance(observer, weakref.WeakMethod):
-                    target = observer()
-                    if target is None:
-                        continue
-                    target(old_value, value)
-                else:
-                    observer(old_value, value)
-        self.__is_observing[key] = False
+        _notify(self, key, value, _dict_setitem, _dict_get, observers)
 
     # --- Internal observer management helpers (avoid external access to private attrs) ---
     def _add_observer(self, key: Any, callback: Observer) -> None:
-        self.__observers.setdefault(key, []).append(_normalize_callback(callback))
+        ref = _normalize_callback(callback, _observer_died(None, id(self), self.__observers, key))
 
-    def _remove_observers(self, key: Optional[Any] = None) -> None:
-        if key is None:
-            self.__observers.clear()
-        else:
-            self.__observers.pop(key, None)
+        def locked() -> None:
+            self.__observers[key] = self.__observers.get(key, ()) + (ref,)
+        _guarded(locked, None)
+
+    def _remove_observer(self, key: Any, callback: Observer) -> bool:
+        def locked() -> bool:
+            remaining = _without(self.__observers.get(key, ()), callback)
+            if remaining is None:
+                return False
+            if remaining:
+                self.__observers[key] = remaining
+            else:
+                del self.__observers[key]
+            return True
+        return _guarded(locked, False)
+
+    def _observers_for(self, key: Any) -> tuple[ObserverRef, ...]:
+        return self.__observers.get(key, ())
+
+    def _remove_observers(self, key: Optional[Any] = None) -> bool:
+        def locked() -> bool:
+            if key is None:
+                removed = bool(self.__observers)
+                self.__observers.clear()
+                return removed
+            return self.__observers.pop(key, None) is not None
+        return _guarded(locked, False)
 
 
 @overload
@@ -149,6 +573,10 @@ def observe(obj: Any, attr: str, callback: Optional[Observer] = None):
         observe(instance, 'field', on_change)
 
     When observing a plain dict, it is wrapped into an ObservableDict which is returned.
+    The wrapper is a shallow copy (the dict's __class__ cannot be reassigned), so
+    build an ObservableDict up front to observe a large mapping without copying it.
+    Called from a finalizer that garbage collection runs inside another observe or
+    remove call on the same thread, registration completes when that call finishes.
     """
     if isinstance(obj, dict) and not isinstance(obj, ObservableDict):
         obj = ObservableDict(obj)
@@ -169,107 +597,26 @@ def add_observer(obj: Any, attr: str, callback: Observer) -> None:
         obj._add_observer(attr, callback)
         return
 
-    # Per-instance storage
-    first_time_for_instance = False
-    if not hasattr(obj, '__observers__'):
-        first_time_for_instance = True
-        # Slotted classes without __dict__ cannot accept new attributes; use fallback containers on class
-        if hasattr(obj, '__dict__'):
-            obj.__observers__ = {}  # type: ignore[attr-defined]
-            obj.__is_observing__ = {}  # type: ignore[attr-defined]
-        else:
-            storage_map, key, is_weak = _weak_or_id_key(obj)
-            storage_map[key] = {'__observers__': {}, '__is_observing__': {}}
-            cls = obj.__class__
-
-            def _finalizer(cls: type = cls) -> None:
-                if hasattr(cls, '__observe_refcount__'):
-                    cls.__observe_refcount__ -= 1  # type: ignore[attr-defined]
-                    if cls.__observe_refcount__ <= 0 and hasattr(cls, '__original_setattr__'):
-                        cls.__setattr__ = cls.__original_setattr__  # type: ignore[attr-defined, method-assign]
-                        del cls.__original_setattr__  # type: ignore[attr-defined]
-                        del cls.__observe_refcount__  # type: ignore[attr-defined]
-
-            if is_weak:
-                storage_map[key]['finalizer'] = weakref.finalize(obj, _finalizer)
-
-    # Resolve storage (normal attribute vs slotted fallback)
-    if not hasattr(obj, '__dict__'):
-        # Resolve storage via weak or id map
-        storage: Optional[_StorageBucket] = None
-        storage_map_w = getattr(obj.__class__, '__allow_observe_storage__', None)
-        if storage_map_w is not None and obj in storage_map_w:
-            storage = storage_map_w[obj]
-        else:
-            storage_map_id = getattr(obj.__class__, '__allow_observe_storage_by_id__', None)
-            if storage_map_id is not None:
-                storage = storage_map_id.get(id(obj))
-        if storage is None:
-            # Ensure bucket exists if somehow missing
-            smap, skey, _ = _weak_or_id_key(obj)
-            storage = smap.setdefault(skey, {'__observers__': {}, '__is_observing__': {}})
-        if attr not in storage['__observers__']:
-            storage['__observers__'][attr] = []
-        storage['__observers__'][attr].append(_normalize_callback(callback))
-    else:
-        if attr not in obj.__observers__:  # type: ignore[attr-defined]
-            obj.__observers__[attr] = []  # type: ignore[index]
-        obj.__observers__[attr].append(_normalize_callback(callback))  # type: ignore[index]
-
-    # Install class-level patch if needed
-    cls = obj.__class__
-    if not hasattr(cls, '__original_setattr__'):
-        cls.__original_setattr__ = cls.__setattr__  # type: ignore[attr-defined, assignment, method-assign]
-        cls.__observe_refcount__ = 0  # type: ignore[attr-defined]
-        cls.__observe_lock__ = threading.RLock()  # type: ignore[attr-defined]
-
-        def new_setattr(self, name, value):  # type: ignore[no-untyped-def]
-            lock = getattr(self.__class__, '__observe_lock__', None)
-            if lock is None:
-                return self.__class__.__original_setattr__(self, name, value)  # type: ignore[attr-defined]
-            with lock:
-                if not hasattr(self, '__dict__'):
-                    storage_map = getattr(self.__class__, '__allow_observe_storage__', None)
-                    storage = storage_map.get(self) if storage_map is not None else None
-                    if storage is None:
-                        storage_map_id = getattr(self.__class__, '__allow_observe_storage_by_id__', None)
-                        if storage_map_id is not None:
-                            storage = storage_map_id.get(id(self))
-                    if storage is None:
-                        self.__class__.__original_setattr__(self, name, value)  # type: ignore[attr-defined]
-                        return
-                    is_observing = storage['__is_observing__']
-                    observers_map = storage['__observers__']
-                else:
-                    if not hasattr(self, '__is_observing__'):
-                        object.__setattr__(self, '__is_observing__', {})
-                    is_observing = self.__is_observing__  # type: ignore[attr-defined]
-                    observers_map = getattr(self, '__observers__', {})  # type: ignore[attr-defined]
-
-                if is_observing.get(name):  # recursion guard
-                    self.__class__.__original_setattr__(self, name, value)  # type: ignore[attr-defined]
-                    return
+    if type(attr) is str:
+        # Attribute names reaching __setattr__ are interned; match them by identity
+        attr = sys.intern(attr)
+    cls = type(obj)
 
-                is_observing[name] = True
-                old_value = getattr(self, name, None)
-                self.__class__.__original_setattr__(self, name, value)  # type: ignore[attr-defined]
+    def locked() -> None:
+        state = _class_state(cls)
+        if state is None:
+            state = _patch_class(cls, _observe_mode(cls, obj))
 
-                if name in observers_map:
-                    for observer in list(observers_map[name]):
-                        if isinstance(observer, weakref.WeakMethod):
-                            target = observer()
-                            if target is None:
-                                continue
-                            target(old_value, value)
-                        else:
-                            observer(old_value, value)
-                is_observing[name] = False
-
-        cls.__setattr__ = new_setattr  # type: ignore[assignment, method-assign]
-
-    # Increment refcount only once per observed instance
-    if first_time_for_instance:
-        cls.__observe_refcount__ += 1  # type: ignore[attr-defined]
+        observers_map = state.bucket(obj)
+        if observers_map is None:
+            observers_map = _create_bucket(state, obj)
+        observers = observers_map.get(attr)
+        if observers is None:
+            state.names[attr] = state.names.get(attr, 0) + 1
+            observers = ()
+        ref = _normalize_callback(callback, _observer_died(state, id(obj), observers_map, attr))
+        observers_map[attr] = observers + (ref,)
+    _guarded(locked, None)
 
 
 def remove_observers(obj: Any, attr: Optional[str] = None) -> bool:
@@ -277,146 +624,118 @@ def remove_observers(obj: Any, attr: Optional[str] = None) -> bool:
 
     If attr is None, all observers for the object are removed.
     For ObservableDict instances, class monkey-patching is not involved.
+    Called from a finalizer that garbage collection runs inside another observe or
+    remove call on the same thread, the removal is deferred until that call
+    finishes and False is returned.
     """
-    removed = False
     if isinstance(obj, ObservableDict):
-        mapping = getattr(obj, '_ObservableDict__observers', {})
+        return obj._remove_observers(attr)
+
+    def locked() -> bool:
+        state = _class_state(type(obj))
+        if state is None:
+            return False
+        observers_map = state.bucket(obj)
+        if observers_map is None:
+            return False
+
         if attr is None:
-            removed = bool(mapping)
+            removed = bool(observers_map)
+            _forget_names(state.names, observers_map)
+            observers_map.clear()
         else:
-            removed = attr in mapping
-        obj._remove_observers(attr)
+            removed = observers_map.pop(attr, None) is not None
+            if removed:
+                _forget_names(state.names, (attr,))
+        if not observers_map:
+            # Last observer gone: drop the bucket and maybe restore the class's __setattr__
+            _drop_bucket(state, obj)
         return removed
-
-    if not hasattr(obj, '__observers__'):
-        # Possibly slotted fallback storage
-        storage_map = getattr(obj.__class__, '__allow_observe_storage__', None)
-        storage_map_id = getattr(obj.__class__, '__allow_observe_storage_by_id__', None)
-        storage: Optional[_StorageBucket] = None
-        key_kind = None
-        if storage_map is not None and obj in storage_map:
-            storage = storage_map[obj]
-            key_kind = 'weak'
-        elif storage_map_id is not None and id(obj) in storage_map_id:
-            storage = storage_map_id[id(obj)]
-            key_kind = 'id'
-        if storage is not None:
-            if attr:
-                removed = attr in storage['__observers__']
-                storage['__observers__'].pop(attr, None)
-            else:
-                removed = bool(storage['__observers__'])
-                storage['__observers__'].clear()
-            if not storage['__observers__']:
-                # Remove storage entry and maybe cleanup class patch
-                finalizer = storage.get('finalizer')
-                if finalizer:
-                    finalizer.detach()
-                if key_kind == 'weak':
-                    assert storage_map is not None
-                    del storage_map[obj]
-                elif key_kind == 'id':
-                    assert storage_map_id is not None
-                    storage_map_id.pop(id(obj), None)
-                cls = obj.__class__
-                if hasattr(cls, '__observe_refcount__'):
-                    cls.__observe_refcount__ -= 1  # type: ignore[attr-defined]
-                    if cls.__observe_refcount__ <= 0 and hasattr(cls, '__original_setattr__'):
-                        cls.__setattr__ = cls.__original_setattr__  # type: ignore[attr-defined]
-                        del cls.__original_setattr__  # type: ignore[attr-defined]
-                        del cls.__observe_refcount__  # type: ignore[attr-defined]
-            return removed
-        return False
-
-    if attr:
-        if attr in obj.__observers__:  # type: ignore[attr-defined]
-            del obj.__observers__[attr]  # type: ignore[attr-defined]
-            removed = True
-    else:
-        removed = removed or bool(obj.__observers__)  # type: ignore[attr-defined]
-        obj.__observers__.clear()  # type: ignore[attr-defined]
-
-    cls = obj.__class__
-    # If this instance now has zero observers, potentially decrement refcount
-    if (not obj.__observers__) and hasattr(cls, '__observe_refcount__'):  # type: ignore[attr-defined]
-        cls.__observe_refcount__ -= 1  # type: ignore[attr-defined]
-        if cls.__observe_refcount__ <= 0 and hasattr(cls, '__original_setattr__'):
-            # Restore original setattr only when no instances remain observed.
-            cls.__setattr__ = cls.__original_setattr__  # type: ignore[attr-defined]
-            del cls.__original_setattr__  # type: ignore[attr-defined]
-            del cls.__observe_refcount__  # type: ignore[attr-defined]
-    return removed
+    return _guarded(locked, False)
 
 
 def remove_observer(obj: Any, attr: str, callback: Observer) -> bool:
     """Remove a single observer callback for given attr/key if present.
 
-    Returns True if a callback was removed; False otherwise.
+    Returns True if a callback was removed; False otherwise (also when deferred
+    from a finalizer, as for remove_observers).
     """
-    removed = False
     if isinstance(obj, ObservableDict):
-        # Access internal map safely
-        # Using getattr with name mangling to satisfy linters
-        mapping = getattr(obj, '_ObservableDict__observers', None)
-        if mapping and attr in mapping:
-            try:
-                mapping[attr].remove(callback)
-                removed = True
-            except ValueError:
-                norm = _normalize_callback(callback)
-                try:
-                    mapping[attr].remove(norm)
-                    removed = True
-                except ValueError:
-                    pass
-        return removed
+        return obj._remove_observer(attr, callback)
 
-    if not hasattr(obj, '__observers__'):
-        storage_map = getattr(obj.__class__, '__allow_observe_storage__', None)
-        storage_map_id = getattr(obj.__class__, '__allow_observe_storage_by_id__', None)
-        storage: Optional[_StorageBucket] = None
-        if storage_map is not None and obj in storage_map:
-            storage = storage_map[obj]
-        elif storage_map_id is not None and id(obj) in storage_map_id:
-            storage = storage_map_id[id(obj)]
-        if storage is None:
+    def locked() -> bool:
+        state = _class_state(type(obj))
+        if state is None:
             return False
-        lst = storage['__observers__'].get(attr)
-        if not lst:
+        observers_map = state.bucket(obj)
+        if observers_map is None:
             return False
-        try:
-            lst.remove(callback)
-            removed = True
-        except ValueError:
-            norm = _normalize_callback(callback)
-            try:
-                lst.remove(norm)
-                removed = True
-            except ValueError:
-                return False
-        if not lst:
-            del storage['__observers__'][attr]
-            if not storage['__observers__']:
-                remove_observers(obj)
-        return removed
-    lst = obj.__observers__.get(attr)  # type: ignore[attr-defined]
-    if not lst:
-        return False
-    try:
-        lst.remove(callback)
-        removed = True
-    except ValueError:
-        norm = _normalize_callback(callback)
-        try:
-            lst.remove(norm)
-            removed = True
-        except ValueError:
+
+        remaining = _without(observers_map.get(attr, ()), callback)
+        if remaining is None:
             return False
-    if not lst:
-        del obj.__observers__[attr]  # type: ignore[attr-defined]
-        if not obj.__observers__:  # type: ignore[attr-defined]
-            remove_observers(obj)
-    return removed
+        if remaining:
+            observers_map[attr] = remaining
+        else:
+            del observers_map[attr]
+            _forget_names(state.names, (attr,))
+            if not observers_map:
+                _drop_bucket(state, obj)
+        return True
+    return _guarded(locked, False)
+
+
+def _current_observers(obj: Any, name: Any) -> tuple[ObserverRef, ...]:
+    """Return the observers registered right now for obj's attr/key."""
+    if isinstance(obj, ObservableDict):
+        return obj._observers_for(name)
+    state = _class_state(type(obj))
+    observers_map = state.bucket(obj) if state is not None else None
+    return observers_map.get(name, ()) if observers_map is not None else ()
+
+
+@contextmanager
+def batched_notifications(obj: _T) -> Iterator[_T]:
+    """Defer and coalesce notifications for obj while the block runs.
+
+    Writes made by the current thread take effect immediately, but observers are
+    not called until the block exits. Each changed attr/key then fires once with
+    (first old value, last new value), to the observers registered at that point.
+    Nested blocks for the same object are folded into the outermost one; writes
+    from other threads notify as usual.
+
+    If an observer raises during the flush, the remaining attrs/keys are still
+    notified and the first exception is re-raised afterwards (unless the block
+    itself raised, in which case that exception propagates).
+    """
+    batches = _batches.pending
+    key = id(obj)
+    if key in batches:
+        yield obj
+        return
+
+    pending: Dict[Any, list[Any]] = {}
+    batches[key] = pending
+    body_raised = True
+    try:
+        yield obj
+        body_raised = False
+    finally:
+        del batches[key]
+        active = _reentry.active
+        error: Optional[Exception] = None
+        for name, (old_value, value) in pending.items():
+            token = (key, name)
+            active.add(token)  # writes made by observers apply without re-notifying
+            try:
+                _dispatch(_current_observers(obj, name), old_value, value)
+            except Exception as exc:
+                if error is None:
+                    error = exc
+            finally:
+                active.discard(token)
+        if error is not None and not body_raised:
+            raise error
 
 
 def clear_all(obj: Any) -> bool:
@@ -433,4 +752,5 @@ __all__ = [
     'remove_observers',
     'remove_observer',
     'clear_all',
+    'batched_notifications',
 ]
@@ -1,13 +1,41 @@
 
 import unittest
-from obj_observe import observe, remove_observers, remove_observer, ObservableDict
+from obj_observe import observe, remove_observers, remove_observer, batched_notifications, ObservableDict
 
 class Player:
+    __slots__ = ('hp', '__weakref__')
+
     def __init__(self, hp):
         self.hp = hp
 
+
+class DictPlayer:
+    def __init__(self, hp):
+        self.hp = hp
+
+
+def _worker(target, attr, value, n):
+    """Assign value to target.attr n times (thread body for the concurrency tests)."""
+    for _ in range(n):
+        setattr(target, attr, value)
+
+
+# Reused by the two-instance tests; _players hands them out and takes them back
+_PLAYER_POOL = [Player(0) for _ in range(4)]
+
 class TestObserve(unittest.TestCase):
 
+    def _players(self, *hps):
+        """Borrow pooled Players set to hps, unobserved and returned after the test."""
+        players = []
+        for hp in hps:
+            p = _PLAYER_POOL.pop()
+            p.hp = hp
+            self.addCleanup(_PLAYER_POOL.append, p)
+            self.addCleanup(remove_observers, p)
+            players.append(p)
+        return players
+
     def test_observe_attribute(self):
         p = Player(100)
         self.hp_changed = False
@@ -83,8 +111,135 @@ class TestObserve(unittest.TestCase):
         p.hp = 10
         self.assertEqual(calls, [(10, 10)])
 
+    def test_old_value_from_class_default_and_first_assignment(self):
+        class D:
+            level = 1
+        d = D()
+        seen = []
+        observe(d, 'level', lambda o, n: seen.append((o, n)))
+        observe(d, 'name', lambda o, n: seen.append((o, n)))
+        d.level = 2
+        d.level = 3
+        d.name = 'x'
+        self.assertEqual(seen, [(1, 2), (2, 3), (None, 'x')])
+
+    def test_dict_backed_instance_observe_and_remove(self):
+        p1, p2 = DictPlayer(1), DictPlayer(2)
+        c = []
+        observe(p1, 'hp', lambda o, n: c.append(('p1', o, n)))
+        observe(p2, 'hp', lambda o, n: c.append(('p2', o, n)))
+        p1.hp = 3
+        self.assertTrue(remove_observers(p1))
+        p1.hp = 4
+        p2.hp = 5
+        self.assertEqual(c, [('p1', 1, 3), ('p2', 2, 5)])
+        self.assertTrue(remove_observers(p2))
+        self.assertNotIn('__observe_state__', DictPlayer.__dict__)
+
+    def test_subclass_patched_independently_of_base(self):
+        class Sub(DictPlayer):
+            pass
+        base, sub = DictPlayer(1), Sub(2)
+        c = []
+        observe(sub, 'hp', lambda o, n: c.append(('sub', n)))
+        observe(base, 'hp', lambda o, n: c.append(('base', n)))
+        sub.hp = 3
+        base.hp = 4
+        self.assertEqual(c, [('sub', 3), ('base', 4)])
+        # Unpatching the subclass restores inheritance, so it sees the base's patch again
+        self.assertTrue(remove_observers(sub))
+        self.assertNotIn('__setattr__', Sub.__dict__)
+        observe(sub, 'hp', lambda o, n: c.append(('sub', n)))
+        del c[:]
+        sub.hp = 5
+        self.assertEqual(c, [('sub', 5)])  # once: the base's patch does not fire it too
+        self.assertTrue(remove_observers(base))
+        self.assertTrue(remove_observers(sub))
+        self.assertNotIn('__observe_state__', DictPlayer.__dict__)
+
+    def test_finalizer_removing_observers_during_observe_does_not_deadlock(self):
+        import gc
+        import threading
+        from unittest import mock
+        import obj_observe.core as core
+        class Model:
+            def __init__(self):
+                self.v = 0
+        class View:
+            def __init__(self, model):
+                self.model = model
+                self.cycle = self
+                observe(model, 'v', lambda o, n: None)
+            def __del__(self):
+                remove_observers(self.model)
+        model = Model()
+        View(model)  # garbage in a cycle: only a collection runs __del__
+
+        create_bucket = core._create_bucket
+
+        def create_bucket_after_gc(state, obj):
+            gc.collect()  # __del__ calls back into the API while observe() holds the lock
+            return create_bucket(state, obj)
+
+        calls = []
+        other = Model()
+
+        def run():
+            with mock.patch.object(core, '_create_bucket', create_bucket_after_gc):
+                observe(other, 'v', lambda o, n: calls.append(n))
+
+        t = threading.Thread(target=run, daemon=True)
+        t.start()
+        t.join(5)
+        self.assertFalse(t.is_alive(), 'observe() deadlocked on a finalizer')
+        other.v = 1
+        self.assertEqual(calls, [1])
+        self.assertFalse(remove_observers(model))  # the finalizer's removal already ran
+        self.assertTrue(remove_observers(other))
+        self.assertNotIn('__observe_state__', Model.__dict__)
+
+    def test_dict_backed_instance_gc_cleanup(self):
+        import gc
+        import weakref as _wr
+        class D:
+            def __init__(self):
+                self.v = 0
+        d = D()
+        observe(d, 'v', lambda o, n, d=d: None)  # observer holds the instance: a real cycle
+        dref = _wr.ref(d)
+        del d
+        gc.collect()
+        self.assertIsNone(dref())
+        self.assertNotIn('__observe_state__', D.__dict__)
+
+    def test_instance_collected_during_observe_keeps_class_patched(self):
+        import gc
+        from unittest import mock
+        import obj_observe.core as core
+        class D:
+            def __init__(self):
+                self.v = 0
+        old = D()
+        observe(old, 'v', lambda o, n, old=old: None)
+        del old  # only a collection frees it now
+
+        create_bucket = core._create_bucket
+
+        def create_bucket_after_gc(state, obj):
+            gc.collect()  # the old instance dies while observe() holds the lock
+            return create_bucket(state, obj)
+
+        calls = []
+        new = D()
+        with mock.patch.object(core, '_create_bucket', create_bucket_after_gc):
+            observe(new, 'v', lambda o, n: calls.append(n))
+        new.v = 1
+        self.assertEqual(calls, [1])
+        self.assertTrue(remove_observers(new))
+        self.assertNotIn('__observe_state__', D.__dict__)
+
     def test_multiple_instances_independent(self):
-        p1, p2 = Player(1), Player(2)
+        p1, p2 = self._players(1, 2)
         c1, c2 = [], []
         observe(p1, 'hp', lambda o, n: c1.append(n))
         observe(p2, 'hp', lambda o, n: c2.append(n))
@@ -142,6 +297,31 @@ class TestObserve(unittest.TestCase):
         d['x'] = 9
         self.assertEqual(d['x'], 9)
 
+    def test_observable_dict_observer_mutates_same_key(self):
+        seen = []
+
+        def obs(o, n):
+            seen.append(n)
+            if n < 5:
+                d['x'] = n + 5  # Should not infinite recurse
+
+        d = observe({'x': 1}, 'x', obs)
+        d['x'] = 2
+        self.assertEqual(d['x'], 7)
+        self.assertEqual(seen, [2])
+
+    def test_observable_dict_remove_single_observer(self):
+        a, b = [], []
+        def oa(o, n): a.append(n)
+        def ob(o, n): b.append(n)
+        d = observe({'x': 1}, 'x', oa)
+        observe(d, 'x', ob)
+        self.assertTrue(remove_observer(d, 'x', oa))
+        self.assertFalse(remove_observer(d, 'x', oa))
+        d['x'] = 2
+        self.assertEqual(a, [])
+        self.assertEqual(b, [2])
+
     def test_chained_observer_adds(self):
         p = Player(1)
         vals = []
@@ -185,13 +365,23 @@ class TestObserve(unittest.TestCase):
         self.assertEqual(y.foo, 2)
 
     def test_attribute_removed_remaining_instance(self):
-        p1, p2 = Player(1), Player(2)
+        p1, p2 = self._players(1, 2)
         observe(p1, 'hp', lambda o, n: None)
         observe(p2, 'hp', lambda o, n: None)
         remove_observers(p1)
         p2.hp = 4
         self.assertEqual(p2.hp, 4)
 
+    def test_repeated_remove_keeps_other_instance_observed(self):
+        p1, p2 = Player(1), Player(2)
+        c = []
+        observe(p1, 'hp', lambda o, n: None)
+        observe(p2, 'hp', lambda o, n: c.append(n))
+        self.assertTrue(remove_observers(p1))
+        self.assertFalse(remove_observers(p1))
+        p2.hp = 5
+        self.assertEqual(c, [5])
+
     def test_remove_all_instances_restores_setattr(self):
         p1 = Player(1)
         observe(p1, 'hp', lambda o, n: None)
@@ -201,7 +391,7 @@ class TestObserve(unittest.TestCase):
         self.assertEqual(p1.hp, 10)
 
     def test_remove_single_then_other_still_active(self):
-        p1, p2 = Player(1), Player(2)
+        p1, p2 = self._players(1, 2)
         c = []
         observe(p1, 'hp', lambda o, n: c.append(('p1', n)))
         observe(p2, 'hp', lambda o, n: c.append(('p2', n)))
@@ -233,11 +423,80 @@ class TestObserve(unittest.TestCase):
             remove_observers(p, 'hp')
 
         observe(p, 'hp', obs1)
-        # Add another after first; because iteration copies the list, second still fires once
+        # Add another after first; iteration runs over the tuple snapshot taken before
+        # the write, so removing observers mid-notify still lets the second fire once
         observe(p, 'hp', lambda o, n: calls.append('b'))
         p.hp = 3
         self.assertEqual(calls, ['a', 'b'])
 
+    def test_observer_exception_does_not_stick_guard(self):
+        p = Player(1)
+        calls = []
+
+        def boom(o, n):
+            calls.append(n)
+            raise RuntimeError('boom')
+
+        observe(p, 'hp', boom)
+        with self.assertRaises(RuntimeError):
+            p.hp = 2
+        with self.assertRaises(RuntimeError):
+            p.hp = 3
+        self.assertEqual(calls, [2, 3])
+
+    def test_observe_inside_callback_applies_to_next_write(self):
+        p = Player(1)
+        calls = []
+
+        def first(o, n):
+            calls.append(('first', n))
+            if n == 2:
+                observe(p, 'hp', lambda o, n: calls.append(('late', n)))
+
+        observe(p, 'hp', first)
+        p.hp = 2
+        p.hp = 3
+        self.assertEqual(calls, [('first', 2), ('first', 3), ('late', 3)])
+
+    def test_batched_notifications_coalesce(self):
+        p = Player(1)
+        calls = []
+        observe(p, 'hp', lambda o, n: calls.append((o, n)))
+        with batched_notifications(p):
+            p.hp = 2
+            p.hp = 3
+            with batched_notifications(p):
+                p.hp = 4
+            self.assertEqual(p.hp, 4)
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [(1, 4)])
+        p.hp = 5
+        self.assertEqual(calls, [(1, 4), (4, 5)])
+
+    def test_batched_notifications_dict(self):
+        calls = []
+        d = observe({'x': 1, 'y': 1}, 'x', lambda o, n: calls.append((o, n)))
+        with batched_notifications(d):
+            d['x'] = 2
+            d['y'] = 5  # unobserved
+            d['x'] = 3
+        self.assertEqual(calls, [(1, 3)])
+
+    def test_batched_notifications_flushes_all_when_observer_raises(self):
+        d = ObservableDict()
+        seen = []
+
+        def boom(o, n):
+            raise ValueError('boom')
+
+        observe(d, 'x', boom)
+        observe(d, 'y', lambda o, n: seen.append(n))
+        with self.assertRaises(ValueError):
+            with batched_notifications(d):
+                d['x'] = 1
+                d['y'] = 2
+        self.assertEqual(seen, [2])
+
     def test_slotted_without_weakref_fallback(self):
         class S:
             __slots__ = ('v',)
@@ -264,12 +523,44 @@ class TestObserve(unittest.TestCase):
         gc.collect()
         self.assertIsNone(wref())
         # Class should eventually restore original setattr when no instances observed
-        self.assertFalse(hasattr(W, '__original_setattr__') and hasattr(W, '__observe_refcount__'))
+        self.assertNotIn('__observe_state__', W.__dict__)
+
+    def test_slotted_old_value_skips_getattribute_hook(self):
+        reads = []
+        class H:
+            __slots__ = ('v', 'w', '__weakref__')
+            def __init__(self):
+                self.v = 0
+            def __getattribute__(self, name):
+                reads.append(name)
+                return object.__getattribute__(self, name)
+        h = H()
+        seen = []
+        observe(h, 'v', lambda o, n: seen.append((o, n)))
+        del reads[:]
+        h.v = 1
+        h.w = 2  # unobserved
+        self.assertEqual(seen, [(0, 1)])
+        self.assertEqual(reads, [])
+
+    def test_slotted_unhashable_instance(self):
+        class U:
+            __slots__ = ('v', '__weakref__')
+            __hash__ = None  # type: ignore[assignment]
+            def __init__(self):
+                self.v = 0
+        u = U()
+        seen = []
+        observe(u, 'v', lambda o, n: seen.append((o, n)))
+        u.v = 1
+        self.assertEqual(seen, [(0, 1)])
+        self.assertTrue(remove_observers(u))
 
     def test_bound_method_observer_does_not_keep_instance_alive(self):
         import gc
         import weakref as _wr
         class Emitter:
+            __slots__ = ('x', '__weakref__')
             def __init__(self):
                 self.x = 0
             def on_x(self, o, n):
@@ -282,21 +573,65 @@ class TestObserve(unittest.TestCase):
         gc.collect()
         self.assertIsNone(wref())
 
+    def test_dead_bound_method_observer_is_pruned(self):
+        class Listener:
+            def on_change(self, o, n):
+                pass
+        class S:
+            __slots__ = ('hp', '__weakref__')
+            def __init__(self):
+                self.hp = 1
+        s = S()
+        d = ObservableDict()
+        keep = lambda o, n: None
+        listener = Listener()
+        observe(s, 'hp', listener.on_change)
+        observe(s, 'hp', keep)
+        observe(d, 'k', listener.on_change)
+        del listener
+        # The dead entries are gone, so removing keep leaves nothing behind
+        self.assertFalse(remove_observers(d, 'k'))
+        self.assertTrue(remove_observer(s, 'hp', keep))
+        self.assertNotIn('__observe_state__', S.__dict__)
+
+    def test_dead_bound_method_only_observer_releases_class(self):
+        class Listener:
+            def on_change(self, o, n):
+                pass
+        class S:
+            __slots__ = ('hp', '__weakref__')
+            def __init__(self):
+                self.hp = 1
+        class D:
+            def __init__(self):
+                self.hp = 1
+        s, d = S(), D()
+        listener = Listener()
+        observe(s, 'hp', listener.on_change)
+        observe(d, 'hp', listener.on_change)
+        del listener
+        # The emptied buckets are released with the dead entry, unpatching both classes
+        self.assertNotIn('__observe_state__', S.__dict__)
+        self.assertNotIn('__observe_state__', D.__dict__)
+        self.assertFalse(remove_observers(s))
+        self.assertFalse(remove_observers(d))
+
     def test_thread_safety_concurrent_sets(self):
         import threading
         class T:
+            __slots__ = ('v', '__weakref__')
             def __init__(self):
                 self.v = 0
         t = T()
         vals = []
         lock = threading.Lock()
-        observe(t, 'v', lambda o, n: (lock.acquire(), vals.append(n), lock.release()))
 
-        def worker(n):
-            for _ in range(100):
-                t.v = n
+        def record(o, n, _l=lock, _v=vals):
+            with _l:
+                _v.append(n)
 
-        threads = [threading.Thread(target=worker, args=(i,)) for i in range(5)]
+        observe(t, 'v', record)
+        threads = [threading.Thread(target=_worker, args=(t, 'v', i, 100)) for i in range(5)]
         for th in threads:
             th.start()
         for th in threads:
@@ -304,5 +639,26 @@ class TestObserve(unittest.TestCase):
         # We should have recorded many values and not deadlocked
         self.assertGreater(len(vals), 0)
 
+    def test_thread_safety_concurrent_observe(self):
+        import threading
+        p = Player(0)
+        calls = []
+        callbacks = [lambda o, n, i=i: calls.append(i) for i in range(8)]
+
+        def worker(cb):
+            for _ in range(50):
+                observe(p, 'hp', cb)
+                remove_observer(p, 'hp', cb)
+            observe(p, 'hp', cb)
+
+        threads = [threading.Thread(target=worker, args=(cb,)) for cb in callbacks]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        p.hp = 1
+        # No registration may be lost to a racing copy-on-write update
+        self.assertEqual(sorted(calls), list(range(8)))
+
 if __name__ == '__main__':
     unittest.main()